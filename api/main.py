@@ -1,10 +1,19 @@
 import os
+import asyncio
+import hashlib
 import logging
+import time
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from itertools import count
+from operator import attrgetter
 
+import msgspec
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 from graphiti_core import Graphiti
@@ -27,6 +36,40 @@ FALKORDB_PASSWORD = os.getenv("FALKORDB_PASSWORD", None)
 # This can be set server-side as a fallback, or passed per-request.
 EMBEDDER_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
+# Embedder and reranker for the server-side key, shared by every Graphiti
+# instance that falls back to it instead of being rebuilt per instance.
+_SERVER_EMBEDDER: OpenAIEmbedder | None = None
+_SERVER_RERANKER: OpenAIRerankerClient | None = None
+if EMBEDDER_API_KEY:
+    _SERVER_EMBEDDER = OpenAIEmbedder(
+        config=OpenAIEmbedderConfig(
+            api_key=EMBEDDER_API_KEY,
+            embedding_model="text-embedding-3-small",
+        )
+    )
+    _SERVER_RERANKER = OpenAIRerankerClient(config=LLMConfig(api_key=EMBEDDER_API_KEY))
+
+# Prime the shared server-key embedder at startup with a tiny embedding call. Off by
+# default since it spends (a few) tokens on every cold start.
+WARMUP_ENABLED = os.getenv("MINDFLOW_WARMUP", "") == "1"
+
+# Upper bound on in-flight FalkorDB work, and how many requests may queue for
+# a slot before new ones are turned away with 503.
+FALKORDB_MAX_CONCURRENCY = int(os.getenv("FALKORDB_MAX_CONCURRENCY", "32"))
+FALKORDB_MAX_QUEUE = int(os.getenv("FALKORDB_MAX_QUEUE", "64"))
+# Same for episode ingestion, which is dominated by LLM and embedding calls.
+INGEST_MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY", "16"))
+INGEST_MAX_QUEUE = int(os.getenv("INGEST_MAX_QUEUE", "32"))
+# Keeps a single /api/ingest_batch call from taking every ingest slot.
+MAX_BATCH_EPISODES = int(os.getenv("MAX_BATCH_EPISODES", "16"))
+
+# Per-session cache of graph responses. Entries expire after
+# GRAPH_CACHE_TTL seconds and are invalidated whenever a session is ingested into.
+GRAPH_CACHE_TTL = float(os.getenv("GRAPH_CACHE_TTL", "30"))
+GRAPH_CACHE_MAX_ENTRIES = int(os.getenv("GRAPH_CACHE_MAX_ENTRIES", "512"))
+SESSION_DRIVER_MAX_ENTRIES = int(os.getenv("SESSION_DRIVER_MAX_ENTRIES", "1024"))
+GRAPHITI_CACHE_MAX_ENTRIES = int(os.getenv("GRAPHITI_CACHE_MAX_ENTRIES", "256"))
+
 driver: FalkorDriver | None = None
 
 
@@ -41,23 +84,106 @@ def get_driver() -> FalkorDriver:
     return driver
 
 
-def make_graphiti(llm_provider: str, llm_api_key: str, embedder_key: str = "") -> Graphiti:
-    """Create a Graphiti instance with user-provided API keys (BYOK)."""
+class ConcurrencyLimiter:
+    """Bound in-flight work to `limit`, shedding load with 503 once `max_queue` callers wait."""
+
+    def __init__(self, limit: int, max_queue: int):
+        self._semaphore = asyncio.Semaphore(limit)
+        self._max_queue = max_queue
+        self._waiting = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked() and self._waiting >= self._max_queue:
+            raise HTTPException(
+                status_code=503,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+# Graph reads and search hold db_slot; add_episode is mostly LLM/embedding
+# time, so it gets its own limit instead of starving cheap reads.
+db_slot = ConcurrencyLimiter(FALKORDB_MAX_CONCURRENCY, FALKORDB_MAX_QUEUE).slot
+ingest_slot = ConcurrencyLimiter(INGEST_MAX_CONCURRENCY, INGEST_MAX_QUEUE).slot
+
+
+# FalkorDB stores each group in a separate graph named by group_id, so every
+# session needs its own cloned driver. Keep the most recently used ones around.
+# Never awaited, so no lock is needed to keep it consistent on the event loop.
+_session_drivers: "OrderedDict[str, FalkorDriver]" = OrderedDict()
+
+
+def get_session_driver(session_id: str) -> FalkorDriver:
+    session_driver = _session_drivers.get(session_id)
+    if session_driver is not None:
+        _session_drivers.move_to_end(session_id)
+        return session_driver
+
+    session_driver = get_driver().clone(session_id)
+    _session_drivers[session_id] = session_driver
+    while len(_session_drivers) > SESSION_DRIVER_MAX_ENTRIES:
+        _session_drivers.popitem(last=False)
+    return session_driver
+
+
+# Graphiti instances (and their HTTP connection pools) keyed by provider and
+# SHA-256 digests of the API keys, so repeat requests reuse warm clients.
+# Instances are shared across sessions; graphiti-core >= 0.30.2 scopes the
+# FalkorDB driver per add_episode call, so concurrent sessions stay isolated.
+_graphiti_instances: "OrderedDict[tuple[str, bytes, bytes], Graphiti]" = OrderedDict()
+
+
+def _key_digest(key: str) -> bytes:
+    return hashlib.sha256(key.encode()).digest()
+
+
+def _resolve_keys(llm_provider: str, llm_api_key: str, openai_api_key: str) -> tuple[str, str]:
+    """Return (llm_key, embedder_key) for a request, or reject it with 400."""
+    if not llm_api_key:
+        raise HTTPException(status_code=400, detail="LLM API key required")
+
     # Determine embedder key: prefer user's OpenAI key, fall back to server env var
-    effective_embedder_key = ""
     if llm_provider == "openai":
-        effective_embedder_key = llm_api_key
-    elif embedder_key:
-        effective_embedder_key = embedder_key
-    elif EMBEDDER_API_KEY:
-        effective_embedder_key = EMBEDDER_API_KEY
-
-    if not effective_embedder_key:
-        raise ValueError(
-            "Embeddings require an OpenAI API key. Either use OpenAI as your LLM provider, "
-            "or set OPENAI_API_KEY on the server for embeddings."
+        embedder_key = llm_api_key
+    else:
+        embedder_key = openai_api_key or EMBEDDER_API_KEY
+
+    if not embedder_key:
+        raise HTTPException(
+            status_code=400,
+            detail="Embeddings require an OpenAI API key. Either use OpenAI as your LLM provider, "
+            "or set OPENAI_API_KEY on the server for embeddings.",
         )
+    return llm_api_key, embedder_key
+
 
+def make_graphiti(llm_provider: str, llm_api_key: str, embedder_key: str) -> Graphiti:
+    """Return a (cached) Graphiti instance for keys resolved by _resolve_keys (BYOK)."""
+    cache_key = (llm_provider, _key_digest(llm_api_key), _key_digest(embedder_key))
+    graphiti = _graphiti_instances.get(cache_key)
+    if graphiti is not None:
+        _graphiti_instances.move_to_end(cache_key)
+        return graphiti
+
+    graphiti = _build_graphiti(llm_provider, llm_api_key, embedder_key)
+    _graphiti_instances[cache_key] = graphiti
+    while len(_graphiti_instances) > GRAPHITI_CACHE_MAX_ENTRIES:
+        _graphiti_instances.popitem(last=False)
+    return graphiti
+
+
+def _build_graphiti(llm_provider: str, llm_api_key: str, embedder_key: str) -> Graphiti:
     if llm_provider == "anthropic":
         try:
             from graphiti_core.llm_client.anthropic_client import AnthropicClient
@@ -82,17 +208,21 @@ def make_graphiti(llm_provider: str, llm_api_key: str, embedder_key: str = "") -
             )
         )
 
-    embedder = OpenAIEmbedder(
-        config=OpenAIEmbedderConfig(
-            api_key=effective_embedder_key,
-            embedding_model="text-embedding-3-small",
+    if embedder_key == EMBEDDER_API_KEY:
+        embedder = _SERVER_EMBEDDER
+        reranker = _SERVER_RERANKER
+    else:
+        embedder = OpenAIEmbedder(
+            config=OpenAIEmbedderConfig(
+                api_key=embedder_key,
+                embedding_model="text-embedding-3-small",
+            )
         )
-    )
 
-    # Reranker also needs an OpenAI key
-    reranker = OpenAIRerankerClient(
-        config=LLMConfig(api_key=effective_embedder_key)
-    )
+        # Reranker also needs an OpenAI key
+        reranker = OpenAIRerankerClient(
+            config=LLMConfig(api_key=embedder_key)
+        )
 
     return Graphiti(
         graph_driver=get_driver(),
@@ -113,6 +243,10 @@ class IngestRequest(BaseModel):
     timestamp: str | None = None
 
 
+class IngestBatchRequest(BaseModel):
+    episodes: list[IngestRequest]
+
+
 class SearchRequest(BaseModel):
     session_id: str
     query: str
@@ -121,7 +255,10 @@ class SearchRequest(BaseModel):
     openai_api_key: str = ""  # Always needed for embeddings
 
 
-class GraphEntity(BaseModel):
+# Response DTOs are msgspec Structs: they are only ever built from trusted
+# graph data, constructed directly (no validation) and encoded straight to JSON.
+
+class GraphEntity(msgspec.Struct):
     id: str
     name: str
     summary: str
@@ -131,7 +268,7 @@ class GraphEntity(BaseModel):
     community: int | None = None
 
 
-class GraphRelationship(BaseModel):
+class GraphRelationship(msgspec.Struct):
     id: str
     source_id: str
     target_id: str
@@ -141,60 +278,107 @@ class GraphRelationship(BaseModel):
     invalid_at: str | None = None
 
 
-class KnowledgeGraphResponse(BaseModel):
+class GraphMetadata(msgspec.Struct):
+    session_id: str
+    entity_count: int
+    relationship_count: int
+    last_updated: str
+
+
+class KnowledgeGraphResponse(msgspec.Struct):
     entities: list[GraphEntity]
     relationships: list[GraphRelationship]
-    metadata: dict
+    metadata: GraphMetadata
+
+
+# NDJSON records for /api/graph/stream: the same shapes, tagged with a "kind" field
+class StreamEntity(GraphEntity, tag="entity", tag_field="kind"):
+    pass
+
 
+class StreamRelationship(GraphRelationship, tag="relationship", tag_field="kind"):
+    pass
 
-class SearchResult(BaseModel):
+
+class StreamMetadata(GraphMetadata, tag="meta", tag_field="kind"):
+    pass
+
+
+class IngestResponse(msgspec.Struct):
+    entities_added: int
+    relationships_added: int
+    # Only the entities/edges touched by this episode; clients merge them into
+    # their copy of the graph and recompute degrees (sent as 0 here).
+    added_entities: list[GraphEntity]
+    added_relationships: list[GraphRelationship]
+
+
+class SearchResult(msgspec.Struct):
     fact: str
     source: str
     target: str
 
 
+class MsgspecResponse(Response):
+    """JSON response encoded with msgspec; the app's default response class."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return msgspec.json.encode(content)
+
+
 # --- App lifecycle ---
 
-indices_built = False
+_indices_built = asyncio.Event()
+_indices_lock = asyncio.Lock()
 
 
 async def ensure_indices(graphiti: Graphiti) -> None:
     """Build indices on first use if not already done."""
-    global indices_built
-    if indices_built:
+    if _indices_built.is_set():
         return
+    # Concurrent cold-start requests wait here instead of all issuing the DDL
+    async with _indices_lock:
+        if _indices_built.is_set():
+            return
+        try:
+            await graphiti.build_indices_and_constraints()
+            _indices_built.set()
+            logger.info("Graphiti indices built successfully")
+        except Exception as e:
+            logger.warning("Failed to build indices: %s", e)
+
+
+async def warm_up_embedder(embedder: OpenAIEmbedder) -> None:
+    """Open the shared embedder's connection before the first user request needs it."""
     try:
-        await graphiti.build_indices_and_constraints()
-        indices_built = True
-        logger.info("Graphiti indices built successfully")
+        await embedder.create(["warmup"])
+        logger.info("OpenAI embedder warmed up")
     except Exception as e:
-        logger.warning(f"Failed to build indices: {e}")
+        logger.warning("Embedder warmup failed: %s", e)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global indices_built
     # Build indices at startup if we have a server-side key
     if EMBEDDER_API_KEY:
         try:
             temp_llm = OpenAIClient(
                 config=LLMConfig(api_key=EMBEDDER_API_KEY, model="gpt-4.1-mini")
             )
-            temp_embedder = OpenAIEmbedder(
-                config=OpenAIEmbedderConfig(api_key=EMBEDDER_API_KEY)
-            )
-            temp_reranker = OpenAIRerankerClient(
-                config=LLMConfig(api_key=EMBEDDER_API_KEY)
-            )
             temp = Graphiti(
                 graph_driver=get_driver(),
                 llm_client=temp_llm,
-                embedder=temp_embedder,
-                cross_encoder=temp_reranker,
+                embedder=_SERVER_EMBEDDER,
+                cross_encoder=_SERVER_RERANKER,
             )
             await ensure_indices(temp)
+            if WARMUP_ENABLED:
+                # Warming the shared embedder primes the pool real requests use
+                await warm_up_embedder(_SERVER_EMBEDDER)
         except Exception as e:
-            logger.warning(f"Failed to build indices on startup: {e}")
+            logger.warning("Failed to build indices on startup: %s", e)
     else:
         logger.info(
             "OPENAI_API_KEY not set — indices will be built on first ingest."
@@ -204,10 +388,17 @@ async def lifespan(app: FastAPI):
 
     # Cleanup
     global driver
+    _graphiti_instances.clear()
+    _session_drivers.clear()
     driver = None
 
 
-app = FastAPI(title="MindFlow API", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="MindFlow API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=MsgspecResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -218,82 +409,180 @@ app.add_middleware(
 )
 
 
+# --- Graph response cache ---
+
+# None of these helpers await, so like _session_drivers they stay consistent
+# on the event loop without a lock. The cache is per process: other workers
+# and instances only see an ingest once their own entry expires.
+_graph_cache: "OrderedDict[str, tuple[float, KnowledgeGraphResponse]]" = OrderedDict()
+_graph_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0, "stale_writes": 0}
+# Set to a fresh value from a global counter on every invalidation, so a graph
+# read that started before an ingest finished cannot overwrite the cache with
+# its pre-ingest snapshot. Bounded like the cache: sessions not in the map
+# report the last evicted generation, which only ever grows, so an eviction
+# during a read also makes its write count as stale (never the reverse).
+_graph_generations: "OrderedDict[str, int]" = OrderedDict()
+_generation_counter = count(1)
+_evicted_generation = 0
+
+
+def get_cached_graph(session_id: str) -> KnowledgeGraphResponse | None:
+    """Return the cached graph for a session, or None if missing/expired."""
+    entry = _graph_cache.get(session_id)
+    if entry is None or time.monotonic() - entry[0] > GRAPH_CACHE_TTL:
+        _graph_cache.pop(session_id, None)
+        _graph_cache_stats["misses"] += 1
+        return None
+    _graph_cache.move_to_end(session_id)
+    _graph_cache_stats["hits"] += 1
+    return entry[1]
+
+
+def graph_generation(session_id: str) -> int:
+    """Current cache generation of a session; read it before fetching the graph."""
+    return _graph_generations.get(session_id, _evicted_generation)
+
+
+def store_cached_graph(session_id: str, graph: KnowledgeGraphResponse, generation: int) -> None:
+    """Cache a graph fetched at `generation`, unless the session was ingested into since."""
+    if graph_generation(session_id) != generation:
+        _graph_cache_stats["stale_writes"] += 1
+        return
+    _graph_cache[session_id] = (time.monotonic(), graph)
+    _graph_cache.move_to_end(session_id)
+    while len(_graph_cache) > GRAPH_CACHE_MAX_ENTRIES:
+        _graph_cache.popitem(last=False)
+
+
+def invalidate_cached_graph(session_id: str) -> None:
+    global _evicted_generation
+    _graph_generations[session_id] = next(_generation_counter)
+    _graph_generations.move_to_end(session_id)
+    while len(_graph_generations) > GRAPH_CACHE_MAX_ENTRIES:
+        # Least recently invalidated first, so this is the highest evicted value
+        _, _evicted_generation = _graph_generations.popitem(last=False)
+    if _graph_cache.pop(session_id, None) is not None:
+        _graph_cache_stats["invalidations"] += 1
+
+
 # --- Helper: build graph response by querying entities/edges directly ---
 
-async def build_graph_response(driver: FalkorDriver, session_id: str) -> KnowledgeGraphResponse:
-    """Retrieve all entities and relationships for a session directly from FalkorDB."""
-    # FalkorDB stores each group in a separate graph named by group_id
-    session_driver = driver.clone(session_id)
+# Generic Graphiti labels that say nothing about what kind of entity a node is
+_NON_TYPE_LABELS = frozenset({"entity", "node", "entitynode"})
 
-    try:
-        nodes = await EntityNode.get_by_group_ids(
-            driver=session_driver,
-            group_ids=[session_id],
+
+def _node_type(labels) -> str:
+    """Return the first meaningful label of a node, lowercased, or "topic"."""
+    return next(
+        (label.lower() for label in labels or () if label.lower() not in _NON_TYPE_LABELS),
+        "topic",
+    )
+
+
+def _to_entity(node: EntityNode, degree: int, cls: type[GraphEntity] = GraphEntity) -> GraphEntity:
+    created_at = getattr(node, "created_at", None)
+    return cls(
+        id=node.uuid,
+        name=node.name,
+        summary=node.summary or "",
+        type=_node_type(getattr(node, "labels", ())),
+        created_at=created_at.isoformat() if created_at else "",
+        degree=degree,
+    )
+
+
+def _to_relationship(
+    edge: EntityEdge, cls: type[GraphRelationship] = GraphRelationship
+) -> GraphRelationship:
+    valid_at = edge.valid_at
+    invalid_at = edge.invalid_at
+    return cls(
+        id=edge.uuid,
+        source_id=edge.source_node_uuid,
+        target_id=edge.target_node_uuid,
+        fact=edge.fact or "",
+        # Prefer Graphiti's extracted relationship name (e.g. IS_A, USES, BUILT_WITH)
+        type=edge.name or "related_to",
+        valid_at=valid_at.isoformat() if valid_at else None,
+        invalid_at=invalid_at.isoformat() if invalid_at else None,
+    )
+
+
+def _graph_metadata(
+    session_id: str,
+    entity_count: int,
+    relationship_count: int,
+    cls: type[GraphMetadata] = GraphMetadata,
+) -> GraphMetadata:
+    return cls(
+        session_id=session_id,
+        entity_count=entity_count,
+        relationship_count=relationship_count,
+        last_updated=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+async def fetch_session_graph(session_id: str) -> tuple[list[EntityNode], list[EntityEdge]]:
+    """Fetch all entity nodes and edges for a session from FalkorDB."""
+    session_driver = get_session_driver(session_id)
+
+    # Nodes and edges are independent queries — fetch them concurrently
+    async with db_slot():
+        nodes, edges = await asyncio.gather(
+            EntityNode.get_by_group_ids(driver=session_driver, group_ids=[session_id]),
+            EntityEdge.get_by_group_ids(driver=session_driver, group_ids=[session_id]),
+            return_exceptions=True,
         )
-    except Exception as e:
-        logger.warning(f"Failed to get nodes for {session_id}: {e}")
+
+    if isinstance(nodes, Exception):
+        logger.warning("Failed to get nodes for %s: %s", session_id, nodes)
         nodes = []
 
-    try:
-        edges = await EntityEdge.get_by_group_ids(
-            driver=session_driver,
-            group_ids=[session_id],
-        )
-    except Exception as e:
-        logger.warning(f"Failed to get edges for {session_id}: {e}")
+    if isinstance(edges, Exception):
+        logger.warning("Failed to get edges for %s: %s", session_id, edges)
         edges = []
 
-    # Count edges per node for degree calculation
-    degree_map: dict[str, int] = {}
-    for edge in edges:
-        degree_map[edge.source_node_uuid] = degree_map.get(edge.source_node_uuid, 0) + 1
-        degree_map[edge.target_node_uuid] = degree_map.get(edge.target_node_uuid, 0) + 1
-
-    entities = []
-    for node in nodes:
-        node_type = "topic"
-        if hasattr(node, "labels") and node.labels:
-            for label in node.labels:
-                if label.lower() not in ("entity", "node", "entitynode"):
-                    node_type = label.lower()
-                    break
-
-        entities.append(GraphEntity(
-            id=node.uuid,
-            name=node.name,
-            summary=node.summary or "",
-            type=node_type,
-            created_at=node.created_at.isoformat() if hasattr(node, "created_at") and node.created_at else "",
-            degree=degree_map.get(node.uuid, 0),
-        ))
+    return nodes, edges
 
-    relationships = []
-    for edge in edges:
-        # Prefer Graphiti's extracted relationship name (e.g. IS_A, USES, BUILT_WITH)
-        rel_type = edge.name if edge.name else "related_to"
-
-        relationships.append(GraphRelationship(
-            id=edge.uuid,
-            source_id=edge.source_node_uuid,
-            target_id=edge.target_node_uuid,
-            fact=edge.fact or "",
-            type=rel_type,
-            valid_at=edge.valid_at.isoformat() if edge.valid_at else None,
-            invalid_at=edge.invalid_at.isoformat() if edge.invalid_at else None,
-        ))
+
+def count_degrees(edges: list[EntityEdge]) -> Counter:
+    """Count edges per node for degree calculation."""
+    # map + attrgetter keeps the whole loop in C (no generator frame per edge)
+    degree_map = Counter(map(attrgetter("source_node_uuid"), edges))
+    degree_map.update(map(attrgetter("target_node_uuid"), edges))
+    return degree_map
+
+
+async def build_graph_response(session_id: str) -> KnowledgeGraphResponse:
+    """Retrieve all entities and relationships for a session directly from FalkorDB."""
+    nodes, edges = await fetch_session_graph(session_id)
+    degree_map = count_degrees(edges)
+
+    entities = [_to_entity(n, degree_map.get(n.uuid, 0)) for n in nodes]
+    relationships = [_to_relationship(e) for e in edges]
 
     return KnowledgeGraphResponse(
         entities=entities,
         relationships=relationships,
-        metadata={
-            "session_id": session_id,
-            "entity_count": len(entities),
-            "relationship_count": len(relationships),
-            "last_updated": datetime.now(timezone.utc).isoformat(),
-        },
+        metadata=_graph_metadata(session_id, len(entities), len(relationships)),
     )
 
 
+async def stream_graph_ndjson(
+    session_id: str,
+    nodes: list[EntityNode],
+    edges: list[EntityEdge],
+) -> AsyncIterator[bytes]:
+    """Yield one NDJSON line per entity, then per relationship, then a metadata record."""
+    encode = msgspec.json.Encoder().encode
+    degree_map = count_degrees(edges)
+    for n in nodes:
+        yield encode(_to_entity(n, degree_map.get(n.uuid, 0), StreamEntity)) + b"\n"
+    for e in edges:
+        yield encode(_to_relationship(e, StreamRelationship)) + b"\n"
+    yield encode(_graph_metadata(session_id, len(nodes), len(edges), StreamMetadata)) + b"\n"
+
+
 # --- Endpoints ---
 
 @app.get("/api/health")
@@ -309,99 +598,213 @@ async def health():
     return {"status": "ok", "falkordb": falkordb_ok}
 
 
+async def add_transcript_episode(graphiti: Graphiti, req: IngestRequest):
+    """Run one transcript chunk through Graphiti and drop the session's cached graph."""
+    ref_time = datetime.now(timezone.utc)
+    if req.timestamp:
+        try:
+            # Python 3.11+ parses the "Z" UTC suffix natively
+            ref_time = datetime.fromisoformat(req.timestamp)
+        except ValueError:
+            pass
+
+    async with ingest_slot():
+        result = await graphiti.add_episode(
+            name=f"{req.session_id}_{int(ref_time.timestamp())}",
+            episode_body=req.text,
+            source=EpisodeType.text,
+            source_description="Live speech transcript from MindFlow",
+            reference_time=ref_time,
+            group_id=req.session_id,
+        )
+    invalidate_cached_graph(req.session_id)
+    return result
+
+
 @app.post("/api/ingest")
 async def ingest(req: IngestRequest):
+    llm_key, embedder_key = _resolve_keys(req.llm_provider, req.llm_api_key, req.openai_api_key)
     if not req.text.strip():
         raise HTTPException(status_code=400, detail="Empty text")
-    if not req.llm_api_key:
-        raise HTTPException(status_code=400, detail="LLM API key required")
 
     try:
-        graphiti = make_graphiti(req.llm_provider, req.llm_api_key, req.openai_api_key)
+        graphiti = make_graphiti(req.llm_provider, llm_key, embedder_key)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     await ensure_indices(graphiti)
 
     try:
-        ref_time = datetime.now(timezone.utc)
-        if req.timestamp:
-            try:
-                ref_time = datetime.fromisoformat(req.timestamp.replace("Z", "+00:00"))
-            except ValueError:
-                pass
+        result = await add_transcript_episode(graphiti, req)
+        nodes = getattr(result, "nodes", None) or []
+        edges = getattr(result, "edges", None) or []
+
+        # The episode result is already hydrated, so return it as a delta
+        # instead of re-reading the whole session graph from FalkorDB
+        return MsgspecResponse(IngestResponse(
+            entities_added=len(nodes),
+            relationships_added=len(edges),
+            added_entities=[_to_entity(n, 0) for n in nodes],
+            added_relationships=[_to_relationship(e) for e in edges],
+        ))
 
-        result = await graphiti.add_episode(
-            name=f"{req.session_id}_{int(ref_time.timestamp())}",
-            episode_body=req.text,
-            source=EpisodeType.text,
-            source_description="Live speech transcript from MindFlow",
-            reference_time=ref_time,
-            group_id=req.session_id,
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Ingest failed: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/ingest_batch")
+async def ingest_batch(req: IngestBatchRequest):
+    """Ingest several transcript chunks at once, returning one result per session.
+
+    Not atomic: each session succeeds or fails on its own, and a failed
+    session keeps the episodes applied before the failure (see
+    `episodes_applied` and `error` in its result).
+    """
+    if not req.episodes:
+        raise HTTPException(status_code=400, detail="No episodes")
+    if len(req.episodes) > MAX_BATCH_EPISODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many episodes (max {MAX_BATCH_EPISODES} per batch)",
         )
 
-        entities_added = len(result.nodes) if hasattr(result, "nodes") else 0
-        relationships_added = len(result.edges) if hasattr(result, "edges") else 0
+    # Episodes of one session are applied in order (later chunks build on
+    # earlier entities); different sessions are ingested concurrently.
+    # make_graphiti hands out one shared instance per provider + key pair.
+    by_session: dict[str, list[tuple[Graphiti, IngestRequest]]] = {}
+    for episode in req.episodes:
+        llm_key, embedder_key = _resolve_keys(
+            episode.llm_provider, episode.llm_api_key, episode.openai_api_key
+        )
+        if not episode.text.strip():
+            raise HTTPException(status_code=400, detail="Empty text")
+        try:
+            graphiti = make_graphiti(episode.llm_provider, llm_key, embedder_key)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        by_session.setdefault(episode.session_id, []).append((graphiti, episode))
 
-        # Retrieve the full graph state for this session
-        graph = await build_graph_response(get_driver(), req.session_id)
+    first_graphiti = next(iter(by_session.values()))[0][0]
+    await ensure_indices(first_graphiti)
 
-        return {
-            "entities_added": entities_added,
-            "relationships_added": relationships_added,
-            "graph": graph.model_dump(),
+    async def ingest_session(session_id: str, episodes: list[tuple[Graphiti, IngestRequest]]) -> dict:
+        outcome = {
+            "session_id": session_id,
+            "episodes_applied": 0,
+            "entities_added": 0,
+            "relationships_added": 0,
         }
+        try:
+            for graphiti, episode in episodes:
+                result = await add_transcript_episode(graphiti, episode)
+                outcome["episodes_applied"] += 1
+                outcome["entities_added"] += len(getattr(result, "nodes", None) or ())
+                outcome["relationships_added"] += len(getattr(result, "edges", None) or ())
+
+            generation = graph_generation(session_id)
+            outcome["graph"] = await build_graph_response(session_id)
+            store_cached_graph(session_id, outcome["graph"], generation)
+        except Exception as e:
+            logger.error("Batch ingest failed for %s: %s", session_id, e, exc_info=True)
+            outcome["error"] = e.detail if isinstance(e, HTTPException) else str(e)
+        return outcome
 
-    except Exception as e:
-        logger.error(f"Ingest failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    sessions = await asyncio.gather(
+        *(ingest_session(session_id, episodes) for session_id, episodes in by_session.items())
+    )
+    return MsgspecResponse({"sessions": sessions})
 
 
 @app.get("/api/graph")
 async def get_graph(session_id: str):
     """Retrieve the knowledge graph for a session. No API key needed — direct DB query."""
+    cached = get_cached_graph(session_id)
+    if cached is not None:
+        return MsgspecResponse(cached)
+
+    generation = graph_generation(session_id)
+    try:
+        graph = await build_graph_response(session_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Get graph failed: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    store_cached_graph(session_id, graph, generation)
+    return MsgspecResponse(graph)
+
+
+@app.get("/api/graph/stream")
+async def stream_graph(session_id: str):
+    """Stream the knowledge graph for a session as NDJSON, for large sessions."""
     try:
-        graph = await build_graph_response(get_driver(), session_id)
-        return graph.model_dump()
+        nodes, edges = await fetch_session_graph(session_id)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Get graph failed: {e}")
+        logger.error("Stream graph failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    return StreamingResponse(
+        stream_graph_ndjson(session_id, nodes, edges),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the in-process graph response cache."""
+    return {**_graph_cache_stats, "entries": len(_graph_cache)}
+
 
 @app.post("/api/search")
 async def search(req: SearchRequest):
+    llm_key, embedder_key = _resolve_keys(req.llm_provider, req.llm_api_key, req.openai_api_key)
     if not req.query.strip():
         raise HTTPException(status_code=400, detail="Empty query")
-    if not req.llm_api_key:
-        raise HTTPException(status_code=400, detail="LLM API key required")
 
     try:
-        graphiti = make_graphiti(req.llm_provider, req.llm_api_key, req.openai_api_key)
+        graphiti = make_graphiti(req.llm_provider, llm_key, embedder_key)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     try:
-        edges = await graphiti.search(
-            query=req.query,
-            group_ids=[req.session_id],
-            num_results=20,
-        )
+        async with db_slot():
+            edges = await graphiti.search(
+                query=req.query,
+                group_ids=[req.session_id],
+                num_results=20,
+            )
 
-        results = []
-        for edge in edges:
-            results.append(SearchResult(
-                fact=edge.fact or "",
-                source=edge.source_node_uuid,
-                target=edge.target_node_uuid,
-            ))
+        results = [
+            SearchResult(fact=edge.fact or "", source=edge.source_node_uuid, target=edge.target_node_uuid)
+            for edge in edges
+        ]
 
-        return {"results": [r.model_dump() for r in results]}
+        return MsgspecResponse({"results": results})
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Search failed: {e}")
+        logger.error("Search failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
+    import sys
+
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8080, reload=True)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8080,
+        # Both ship with uvicorn[standard], except uvloop on Windows
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        reload=os.getenv("MINDFLOW_RELOAD", "") == "1",
+    )
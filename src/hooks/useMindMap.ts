@@ -3,12 +3,13 @@ import type {
   MindMap,
   MindMapNode,
   KnowledgeGraph,
+  KnowledgeGraphDelta,
   TranscriptChunk,
   InterpretationLevel,
   LLMProvider,
 } from '../types/mindmap';
 import { incrementalUpdate, fullRegeneration } from '../services/llm';
-import { ingest as graphApiIngest } from '../services/graphApi';
+import { ingest as graphApiIngest, getGraph } from '../services/graphApi';
 
 function collectNodeSignatures(node: MindMapNode, map: Map<string, string>): void {
   map.set(node.id, node.label);
@@ -41,8 +42,38 @@ function diffGraph(prev: KnowledgeGraph | null, next: KnowledgeGraph): Set<strin
   return changed;
 }
 
+function mergeGraph(
+  prev: KnowledgeGraph | null,
+  delta: KnowledgeGraphDelta,
+  sessionId: string
+): KnowledgeGraph {
+  const entities = new Map((prev?.entities || []).map((e) => [e.id, e]));
+  for (const entity of delta.entities) entities.set(entity.id, entity);
+  const relationships = new Map((prev?.relationships || []).map((r) => [r.id, r]));
+  for (const rel of delta.relationships) relationships.set(rel.id, rel);
+
+  // Degrees depend on the whole graph, so recount them after merging
+  const degrees = new Map<string, number>();
+  for (const rel of relationships.values()) {
+    degrees.set(rel.source_id, (degrees.get(rel.source_id) || 0) + 1);
+    degrees.set(rel.target_id, (degrees.get(rel.target_id) || 0) + 1);
+  }
+
+  return {
+    entities: [...entities.values()].map((e) => ({ ...e, degree: degrees.get(e.id) || 0 })),
+    relationships: [...relationships.values()],
+    metadata: {
+      session_id: sessionId,
+      entity_count: entities.size,
+      relationship_count: relationships.size,
+      last_updated: new Date().toISOString(),
+    },
+  };
+}
+
 const INCREMENTAL_INTERVAL_MS = 5000;
 const FULL_REGEN_INTERVAL = 10;
+const GRAPH_RECONCILE_INTERVAL = 10; // backend ingests between full graph refetches
 const AUTOSAVE_INTERVAL_MS = 30000;
 const MAX_TRANSCRIPT_CHARS = 50000; // ~12,500 tokens, safe for most models
 
@@ -76,6 +107,7 @@ export function useMindMap({
   const fullTranscriptRef = useRef<string>('');
   const pendingChunksRef = useRef<string>('');
   const updateCountRef = useRef(0);
+  const backendIngestCountRef = useRef(0);
   const forceFullRegenRef = useRef(false);
   const timerRef = useRef<ReturnType<typeof setInterval> | null>(null);
   const isProcessingRef = useRef(false);
@@ -130,10 +162,34 @@ export function useMindMap({
 
     const newText = pendingChunksRef.current;
     pendingChunksRef.current = '';
+    const sid = sessionIdRef.current || `s_${Date.now()}`;
+
+    const applyGraph = (next: KnowledgeGraph) => {
+      // Track new entities
+      const changed = diffGraph(knowledgeGraphRef.current, next);
+      setActiveNodeIds(changed);
+      if (changed.size > 0) {
+        setTimeout(() => setActiveNodeIds(new Set()), 3000);
+      }
+
+      setKnowledgeGraph(next);
+      knowledgeGraphRef.current = next;
+    };
+
+    // Fold the server's full graph into ours (server wins per id). A union
+    // rather than a replace, since another backend instance may serve a graph
+    // cached before our latest ingest. Best effort: retried on the next one.
+    const reconcile = async () => {
+      try {
+        const serverGraph = await getGraph(backendUrlRef.current, sid);
+        applyGraph(mergeGraph(knowledgeGraphRef.current, serverGraph, sid));
+      } catch {
+        // Ignore — reconciliation is retried later
+      }
+    };
 
     try {
-      const sid = sessionIdRef.current || `s_${Date.now()}`;
-      const result = await graphApiIngest(
+      const delta = await graphApiIngest(
         backendUrlRef.current,
         sid,
         newText,
@@ -142,16 +198,13 @@ export function useMindMap({
         openaiApiKeyRef.current,
         new Date().toISOString()
       );
+      applyGraph(mergeGraph(knowledgeGraphRef.current, delta, sid));
 
-      // Track new entities
-      const changed = diffGraph(knowledgeGraphRef.current, result);
-      setActiveNodeIds(changed);
-      if (changed.size > 0) {
-        setTimeout(() => setActiveNodeIds(new Set()), 3000);
+      // Deltas can't repair earlier gaps, so periodically resync with the server
+      backendIngestCountRef.current++;
+      if (backendIngestCountRef.current % GRAPH_RECONCILE_INTERVAL === 0) {
+        await reconcile();
       }
-
-      setKnowledgeGraph(result);
-      knowledgeGraphRef.current = result;
     } catch (err) {
       const msg = (err as Error).message;
       if (msg.includes('401') || msg.toLowerCase().includes('api key') || msg.toLowerCase().includes('unauthorized')) {
@@ -163,6 +216,9 @@ export function useMindMap({
       }
       // Re-queue the text so it's not lost
       pendingChunksRef.current = newText + ' ' + pendingChunksRef.current;
+      // The server may have applied the episode even though the response was
+      // lost (e.g. timeout), so pick up whatever it has now
+      await reconcile();
     } finally {
       isProcessingRef.current = false;
       setIsProcessing(false);
@@ -321,6 +377,7 @@ export function useMindMap({
     fullTranscriptRef.current = '';
     pendingChunksRef.current = '';
     updateCountRef.current = 0;
+    backendIngestCountRef.current = 0;
     forceFullRegenRef.current = false;
     setLlmError(null);
   }, []);
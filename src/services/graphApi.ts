@@ -1,4 +1,10 @@
-import type { KnowledgeGraph, LLMProvider } from '../types/mindmap';
+import type {
+  GraphEntity,
+  GraphRelationship,
+  KnowledgeGraph,
+  KnowledgeGraphDelta,
+  LLMProvider,
+} from '../types/mindmap';
 
 const REQUEST_TIMEOUT_MS = 30000;
 
@@ -31,6 +37,30 @@ function normalizeBaseUrl(url: string): string {
   return url.replace(/\/+$/, '');
 }
 
+function toEntity(e: Record<string, unknown>): GraphEntity {
+  return {
+    id: e.id as string,
+    name: e.name as string,
+    summary: (e.summary || '') as string,
+    type: (e.type || 'topic') as string,
+    created_at: (e.created_at || '') as string,
+    degree: (e.degree || 0) as number,
+    community: e.community as number | undefined,
+  };
+}
+
+function toRelationship(r: Record<string, unknown>): GraphRelationship {
+  return {
+    id: r.id as string,
+    source_id: r.source_id as string,
+    target_id: r.target_id as string,
+    fact: (r.fact || '') as string,
+    type: (r.type || 'related_to') as string,
+    valid_at: r.valid_at as string | undefined,
+    invalid_at: r.invalid_at as string | undefined,
+  };
+}
+
 export async function ingest(
   baseUrl: string,
   sessionId: string,
@@ -39,7 +69,7 @@ export async function ingest(
   apiKey: string,
   openaiApiKey: string,
   timestamp?: string
-): Promise<KnowledgeGraph> {
+): Promise<KnowledgeGraphDelta> {
   const url = `${normalizeBaseUrl(baseUrl)}/api/ingest`;
 
   const response = await fetchWithTimeout(url, {
@@ -61,33 +91,10 @@ export async function ingest(
   }
 
   const data = await response.json();
-  const graph = data.graph || data;
 
   return {
-    entities: (graph.entities || []).map((e: Record<string, unknown>) => ({
-      id: e.id as string,
-      name: e.name as string,
-      summary: (e.summary || '') as string,
-      type: (e.type || 'topic') as string,
-      created_at: (e.created_at || '') as string,
-      degree: (e.degree || 0) as number,
-      community: e.community as number | undefined,
-    })),
-    relationships: (graph.relationships || []).map((r: Record<string, unknown>) => ({
-      id: r.id as string,
-      source_id: r.source_id as string,
-      target_id: r.target_id as string,
-      fact: (r.fact || '') as string,
-      type: (r.type || 'related_to') as string,
-      valid_at: r.valid_at as string | undefined,
-      invalid_at: r.invalid_at as string | undefined,
-    })),
-    metadata: {
-      session_id: sessionId,
-      entity_count: (graph.metadata?.entity_count || graph.entities?.length || 0) as number,
-      relationship_count: (graph.metadata?.relationship_count || graph.relationships?.length || 0) as number,
-      last_updated: (graph.metadata?.last_updated || new Date().toISOString()) as string,
-    },
+    entities: (data.added_entities || []).map(toEntity),
+    relationships: (data.added_relationships || []).map(toRelationship),
   };
 }
 
@@ -107,24 +114,8 @@ export async function getGraph(
   const graph = await response.json();
 
   return {
-    entities: (graph.entities || []).map((e: Record<string, unknown>) => ({
-      id: e.id as string,
-      name: e.name as string,
-      summary: (e.summary || '') as string,
-      type: (e.type || 'topic') as string,
-      created_at: (e.created_at || '') as string,
-      degree: (e.degree || 0) as number,
-      community: e.community as number | undefined,
-    })),
-    relationships: (graph.relationships || []).map((r: Record<string, unknown>) => ({
-      id: r.id as string,
-      source_id: r.source_id as string,
-      target_id: r.target_id as string,
-      fact: (r.fact || '') as string,
-      type: (r.type || 'related_to') as string,
-      valid_at: r.valid_at as string | undefined,
-      invalid_at: r.invalid_at as string | undefined,
-    })),
+    entities: (graph.entities || []).map(toEntity),
+    relationships: (graph.relationships || []).map(toRelationship),
     metadata: {
       session_id: sessionId,
       entity_count: (graph.metadata?.entity_count || graph.entities?.length || 0) as number,
@@ -101,6 +101,12 @@ export interface KnowledgeGraph {
   metadata: KnowledgeGraphMetadata;
 }
 
+/** Entities/relationships touched by a single ingest, merged into the graph client-side. */
+export interface KnowledgeGraphDelta {
+  entities: GraphEntity[];
+  relationships: GraphRelationship[];
+}
+
 export interface Session {
   id: string;
   title: string;